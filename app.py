@@ -2,8 +2,69 @@
 Streamlit UI for comparing base model vs fine-tuned model responses.
 """
 
+import html
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from string import Template
+
 import streamlit as st
-from core import setup_openai_client, load_config, chat_with_model
+from core import setup_openai_client, load_config, stream_response
+
+# Sentinel marking the end of a streamed response.
+_STREAM_DONE = object()
+
+# Selectable base models and a reverse index for O(1) default lookup.
+_BASE_MODELS = ("gpt-3.5-turbo", "gpt-4o-mini", "gpt-4o", "gpt-4-turbo")
+_BASE_INDEX = {model: i for i, model in enumerate(_BASE_MODELS)}
+
+# In-process LRU of finished responses keyed by (model, user message, system
+# message, previous response ID). st.cache_data cannot replay a stream, so
+# completed text is memoized here and clicking Compare again with identical
+# inputs skips the paid API calls entirely.
+_RESPONSE_CACHE = OrderedDict()
+_RESPONSE_CACHE_LOCK = threading.Lock()
+_RESPONSE_CACHE_MAX_ENTRIES = 128
+_RESPONSE_CACHE_TTL = 3600
+
+
+def _response_cache_get(key):
+    """Return a cached response for key, or None if absent or expired."""
+    with _RESPONSE_CACHE_LOCK:
+        entry = _RESPONSE_CACHE.get(key)
+        if entry is None:
+            return None
+        cached_at, response = entry
+        if time.monotonic() - cached_at > _RESPONSE_CACHE_TTL:
+            del _RESPONSE_CACHE[key]
+            return None
+        _RESPONSE_CACHE.move_to_end(key)
+        return response
+
+
+def _response_cache_put(key, response):
+    """Store a finished response, evicting the least recently used entries."""
+    with _RESPONSE_CACHE_LOCK:
+        _RESPONSE_CACHE[key] = (time.monotonic(), response)
+        _RESPONSE_CACHE.move_to_end(key)
+        while len(_RESPONSE_CACHE) > _RESPONSE_CACHE_MAX_ENTRIES:
+            _RESPONSE_CACHE.popitem(last=False)
+
+# Precompiled history-entry markup; Template.substitute with escaped content
+# is cheaper than rebuilding f-string HTML on every rerun and keeps raw model
+# output out of the markup.
+_HISTORY_TEMPLATE = Template(
+    """
+<div class="history-item">
+    <strong>#$number</strong> - $user...
+    <div class="history-row">
+        <div class="history-col">🤖 <strong>Base:</strong> $base...</div>
+        <div class="history-col">✨ <strong>Fine-tuned:</strong> $finetuned...</div>
+    </div>
+</div>
+"""
+)
 
 # Page config
 st.set_page_config(
@@ -14,7 +75,10 @@ st.set_page_config(
 )
 
 # Custom CSS for fancy light theme styling
-st.markdown("""
+@st.cache_data
+def _css() -> str:
+    """Return the theme CSS once; st.html skips the markdown pipeline."""
+    return """
 <style>
     /* Main background */
     .stApp {
@@ -35,47 +99,12 @@ st.markdown("""
         border-right: 2px solid #e94560;
     }
     
-    /* Response cards */
-    .response-card {
-        background: #ffffff;
-        border-radius: 16px;
-        padding: 24px;
-        border: 2px solid #e94560;
-        box-shadow: 0 4px 20px rgba(233, 69, 96, 0.1);
-        margin: 10px 0;
-    }
-    
-    .response-card-finetuned {
+    /* Response cards (native bordered containers) */
+    [data-testid="stVerticalBlockBorderWrapper"] {
         background: #ffffff;
         border-radius: 16px;
-        padding: 24px;
-        border: 2px solid #10b981;
-        box-shadow: 0 4px 20px rgba(16, 185, 129, 0.1);
-        margin: 10px 0;
     }
-    
-    .card-title {
-        font-size: 14px;
-        font-weight: 600;
-        text-transform: uppercase;
-        letter-spacing: 2px;
-        margin-bottom: 12px;
-    }
-    
-    .card-title-base {
-        color: #e94560;
-    }
-    
-    .card-title-finetuned {
-        color: #10b981;
-    }
-    
-    .response-text {
-        color: #1f2937;
-        font-size: 16px;
-        line-height: 1.8;
-    }
-    
+
     /* Input styling */
     .stTextArea textarea {
         background-color: #ffffff !important;
@@ -117,13 +146,6 @@ st.markdown("""
         box-shadow: 0 8px 24px rgba(233, 69, 96, 0.3) !important;
     }
     
-    /* Divider */
-    .fancy-divider {
-        height: 2px;
-        background: linear-gradient(90deg, transparent, #e94560, transparent);
-        margin: 20px 0;
-    }
-    
     /* Info box */
     .info-box {
         background: #fff5f5;
@@ -141,33 +163,74 @@ st.markdown("""
         color: #e94560;
     }
     
+    /* History */
+    .history-item {
+        border-bottom: 1px solid #e2e8f0;
+        padding: 8px 0;
+        color: #1f2937;
+    }
+
+    .history-row {
+        display: flex;
+        gap: 16px;
+    }
+
+    .history-col {
+        flex: 1;
+    }
+
     /* Labels */
     .stSelectbox label, .stTextArea label, .stTextInput label {
         color: #1f2937 !important;
         font-weight: 500 !important;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+st.html(_css())
+
+
+@st.cache_data
+def _cached_load_config(config_path: str = "config.yaml") -> dict:
+    """Load config once and share the parsed dict across reruns and sessions."""
+    return load_config(config_path)
 
 
 def init_session_state():
     """Initialize session state variables."""
     if "messages_history" not in st.session_state:
-        st.session_state.messages_history = []
+        # Ring buffer: caps memory instead of growing without bound
+        st.session_state.messages_history = deque(maxlen=50)
+    if "_history_html" not in st.session_state:
+        # Pre-rendered history blocks, newest first; each block is built once
+        # when the compare finishes instead of on every rerun
+        st.session_state._history_html = deque(maxlen=5)
+        st.session_state._history_count = 0
     if "config" not in st.session_state:
         try:
-            st.session_state.config = load_config()
+            st.session_state.config = _cached_load_config()
         except FileNotFoundError:
             st.session_state.config = None
     if "client" not in st.session_state:
         st.session_state.client = None
 
 
+@st.cache_resource
+def _get_shared_client(api_key: str, base_url: str):
+    """Build one OpenAI client (and its connection pool) shared across sessions."""
+    return setup_openai_client({"openai": {"api_key": api_key, "base_url": base_url}})
+
+
 def get_client():
     """Get or create OpenAI client."""
     if st.session_state.client is None and st.session_state.config:
+        openai_config = st.session_state.config.get("openai", {})
         try:
-            st.session_state.client = setup_openai_client(st.session_state.config)
+            st.session_state.client = _get_shared_client(
+                openai_config.get("api_key", ""),
+                openai_config.get("base_url", ""),
+            )
         except ValueError as e:
             st.error(f"❌ {e}")
             return None
@@ -178,16 +241,15 @@ def render_sidebar():
     """Render sidebar with model configuration."""
     with st.sidebar:
         st.markdown("## ⚙️ Configuration")
-        st.markdown('<div class="fancy-divider"></div>', unsafe_allow_html=True)
-        
+        st.divider()
+
         # Base model selection
-        base_models = ["gpt-3.5-turbo", "gpt-4o-mini", "gpt-4o", "gpt-4-turbo"]
-        default_base = st.session_state.config.get("fine_tuning", {}).get("model", "gpt-3.5-turbo") if st.session_state.config else "gpt-3.5-turbo"
-        
+        default_base = (st.session_state.config or {}).get("fine_tuning", {}).get("model", "gpt-3.5-turbo")
+
         base_model = st.selectbox(
             "🤖 Base Model",
-            base_models,
-            index=base_models.index(default_base) if default_base in base_models else 0,
+            _BASE_MODELS,
+            index=_BASE_INDEX.get(default_base, 0),
             help="The original model before fine-tuning"
         )
         
@@ -199,7 +261,7 @@ def render_sidebar():
             help="Your fine-tuned model ID from OpenAI"
         )
         
-        st.markdown('<div class="fancy-divider"></div>', unsafe_allow_html=True)
+        st.divider()
         
         # System message
         system_message = st.text_area(
@@ -209,7 +271,7 @@ def render_sidebar():
             help="The system prompt for both models"
         )
         
-        st.markdown('<div class="fancy-divider"></div>', unsafe_allow_html=True)
+        st.divider()
         
         # Info
         st.markdown("""
@@ -222,18 +284,69 @@ def render_sidebar():
         return base_model, finetuned_model, system_message
 
 
-def render_response_card(title: str, response: str, is_finetuned: bool = False):
-    """Render a styled response card."""
-    card_class = "response-card-finetuned" if is_finetuned else "response-card"
-    title_class = "card-title-finetuned" if is_finetuned else "card-title-base"
+def _stream_to_queue(
+    client, model, user_message, system_message, previous_response_id, out_queue, result
+):
+    """
+    Consume a response stream on a worker thread, pushing chunks into a queue.
+
+    The completed response ID lands in ``result`` so the main thread can
+    store it for the next turn of the conversation.
+    """
+    stream = stream_response(
+        client, model, user_message, system_message, previous_response_id
+    )
+    try:
+        while True:
+            out_queue.put(next(stream))
+    except StopIteration as stop:
+        result["response_id"] = stop.value
+        out_queue.put(_STREAM_DONE)
+    except Exception as e:
+        out_queue.put(e)
+
+
+def _drain_queue(out_queue):
+    """
+    Yield streamed chunks from a worker thread until the stream ends.
+
+    Deltas are batched to roughly 10 re-renders per second (or on paragraph
+    breaks), since every yield makes st.write_stream re-parse the whole
+    accumulated markdown buffer.
+    """
+    buffer = ""
+    last_yield = time.monotonic()
+    while True:
+        item = out_queue.get()
+        if item is _STREAM_DONE:
+            if buffer:
+                yield buffer
+            return
+        if isinstance(item, Exception):
+            raise item
+        buffer += item
+        now = time.monotonic()
+        if now - last_yield > 0.1 or "\n\n" in item:
+            yield buffer
+            buffer = ""
+            last_yield = now
+
+
+def render_response_card(title: str, content, is_finetuned: bool = False) -> str:
+    """
+    Render a response card as a native bordered container.
+
+    ``content`` may be a plain string or a generator of streamed chunks;
+    streamed content is rendered incrementally via st.write_stream.
+    """
     icon = "✨" if is_finetuned else "🤖"
-    
-    st.markdown(f"""
-    <div class="{card_class}">
-        <div class="card-title {title_class}">{icon} {title}</div>
-        <div class="response-text">{response}</div>
-    </div>
-    """, unsafe_allow_html=True)
+
+    with st.container(border=True):
+        st.caption(f"{icon} {title}")
+        if isinstance(content, str):
+            st.write(content)
+            return content
+        return st.write_stream(content)
 
 
 def main():
@@ -242,7 +355,7 @@ def main():
     # Header
     st.markdown("# 🎯 LLM Fine-tuning Comparison")
     st.markdown("Compare responses between **base model** and **fine-tuned model** side by side.")
-    st.markdown('<div class="fancy-divider"></div>', unsafe_allow_html=True)
+    st.divider()
     
     # Check config
     if not st.session_state.config:
@@ -267,7 +380,7 @@ def main():
         st.markdown("<br>", unsafe_allow_html=True)
         compare_button = st.button("⚡ Compare", use_container_width=True)
     
-    st.markdown('<div class="fancy-divider"></div>', unsafe_allow_html=True)
+    st.divider()
     
     # Compare responses
     if compare_button:
@@ -287,55 +400,105 @@ def main():
         st.markdown("### 📤 Prompt")
         st.info(f"**System:** {system_message}\n\n**User:** {user_message}")
         
-        st.markdown('<div class="fancy-divider"></div>', unsafe_allow_html=True)
+        st.divider()
         st.markdown("### 📥 Responses")
         
-        # Get responses
+        # Stream both responses, generating concurrently on worker threads
+        base_response = ft_response = None
+        base_queue = queue.Queue()
+        ft_queue = queue.Queue()
+        base_result = {}
+        ft_result = {}
+        base_key = (
+            base_model,
+            user_message,
+            system_message,
+            st.session_state.get(f"resp_id::{base_model}"),
+        )
+        ft_key = (
+            finetuned_model,
+            user_message,
+            system_message,
+            st.session_state.get(f"resp_id::{finetuned_model}"),
+        )
+        base_cached = _response_cache_get(base_key)
+        ft_cached = _response_cache_get(ft_key)
+
+        for model, out_queue, result, cached in (
+            (base_model, base_queue, base_result, base_cached),
+            (finetuned_model, ft_queue, ft_result, ft_cached),
+        ):
+            if cached is None:
+                threading.Thread(
+                    target=_stream_to_queue,
+                    args=(
+                        client,
+                        model,
+                        user_message,
+                        system_message,
+                        st.session_state.get(f"resp_id::{model}"),
+                        out_queue,
+                        result,
+                    ),
+                    daemon=True,
+                ).start()
+
         col_base, col_ft = st.columns(2)
-        
+
         with col_base:
-            with st.spinner("🤖 Base model thinking..."):
-                try:
-                    base_response = chat_with_model(
-                        client, base_model, user_message, system_message
-                    )
-                    render_response_card(f"Base Model ({base_model})", base_response)
-                except Exception as e:
-                    st.error(f"❌ Base model error: {e}")
-        
+            try:
+                base_response = render_response_card(
+                    f"Base Model ({base_model})",
+                    base_cached if base_cached is not None else _drain_queue(base_queue),
+                )
+                if base_cached is None:
+                    _response_cache_put(base_key, base_response)
+            except Exception as e:
+                st.error(f"❌ Base model error: {e}")
+
         with col_ft:
-            with st.spinner("✨ Fine-tuned model thinking..."):
-                try:
-                    ft_response = chat_with_model(
-                        client, finetuned_model, user_message, system_message
-                    )
-                    render_response_card("Fine-tuned Model", ft_response, is_finetuned=True)
-                except Exception as e:
-                    st.error(f"❌ Fine-tuned model error: {e}")
+            try:
+                ft_response = render_response_card(
+                    "Fine-tuned Model",
+                    ft_cached if ft_cached is not None else _drain_queue(ft_queue),
+                    is_finetuned=True,
+                )
+                if ft_cached is None:
+                    _response_cache_put(ft_key, ft_response)
+            except Exception as e:
+                st.error(f"❌ Fine-tuned model error: {e}")
         
-        # Save to history
-        st.session_state.messages_history.append({
-            "user": user_message,
-            "system": system_message,
-            "base_model": base_model,
-            "base_response": base_response if 'base_response' in dir() else "Error",
-            "finetuned_model": finetuned_model,
-            "finetuned_response": ft_response if 'ft_response' in dir() else "Error",
-        })
+        # Remember each model's response ID so the next turn only sends the delta
+        for model, result in ((base_model, base_result), (finetuned_model, ft_result)):
+            if result.get("response_id"):
+                st.session_state[f"resp_id::{model}"] = result["response_id"]
+
+        # Save to history (skip if either model errored out)
+        if base_response is not None and ft_response is not None:
+            st.session_state.messages_history.append({
+                "user": user_message,
+                "system": system_message,
+                "base_model": base_model,
+                "base_response": base_response,
+                "finetuned_model": finetuned_model,
+                "finetuned_response": ft_response,
+            })
+            st.session_state._history_count += 1
+            st.session_state._history_html.appendleft(
+                _HISTORY_TEMPLATE.substitute(
+                    number=st.session_state._history_count,
+                    user=html.escape(user_message[:50]),
+                    base=html.escape(base_response[:200]),
+                    finetuned=html.escape(ft_response[:200]),
+                )
+            )
     
-    # History
-    if st.session_state.messages_history:
-        st.markdown('<div class="fancy-divider"></div>', unsafe_allow_html=True)
-        
+    # History (blocks were rendered when each compare finished)
+    if st.session_state._history_html:
+        st.divider()
+
         with st.expander("📜 Comparison History", expanded=False):
-            for i, item in enumerate(reversed(st.session_state.messages_history[-5:])):
-                st.markdown(f"**#{len(st.session_state.messages_history) - i}** - {item['user'][:50]}...")
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.markdown(f"🤖 **Base:** {item['base_response'][:200]}...")
-                with col2:
-                    st.markdown(f"✨ **Fine-tuned:** {item['finetuned_response'][:200]}...")
-                st.markdown("---")
+            st.html("".join(st.session_state._history_html))
 
 
 if __name__ == "__main__":
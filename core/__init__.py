@@ -2,45 +2,59 @@
 Core module for OpenAI fine-tuning operations.
 """
 
-from core.client import setup_openai_client
-from core.utils import (
-    load_config,
-    ensure_results_dir,
-    get_output_filename,
-    load_training_data,
-)
-from core.validation import validate_data_format
-from core.operations import (
-    upload_training_file,
-    create_fine_tuning_job,
-    get_job_status,
-    wait_for_job_completion,
-    list_files,
-    list_jobs,
-    chat_with_model,
-    compare_models,
-    download_result_file,
-)
+import importlib
 
-__all__ = [
+# Attribute -> submodule map for lazy imports (PEP 562). Keeping these lazy
+# means importing core for config loading or validation does not drag in the
+# OpenAI SDK (httpx, pydantic, anyio) until a client is actually needed.
+_LAZY_IMPORTS = {
     # Client
-    "setup_openai_client",
+    "setup_openai_client": "core.client",
+    "setup_async_openai_client": "core.client",
+    "close_clients": "core.client",
+    "run_async": "core.client",
     # Utils
-    "load_config",
-    "ensure_results_dir",
-    "get_output_filename",
-    "load_training_data",
+    "FineTuneConfig": "core.utils",
+    "load_config": "core.utils",
+    "ensure_results_dir": "core.utils",
+    "get_output_filename": "core.utils",
+    "load_training_data": "core.utils",
+    "iter_training_data": "core.utils",
+    # Async runner
+    "run_with_limits": "core.async_runner",
+    # Cache
+    "cache_get": "core.cache",
+    "cache_set": "core.cache",
     # Validation
-    "validate_data_format",
+    "validate_data_format": "core.validation",
+    "validate_file_parallel": "core.validation",
     # Operations
-    "upload_training_file",
-    "create_fine_tuning_job",
-    "get_job_status",
-    "wait_for_job_completion",
-    "list_files",
-    "list_jobs",
-    "chat_with_model",
-    "compare_models",
-    "download_result_file",
-]
+    "upload_training_file": "core.operations",
+    "create_fine_tuning_job": "core.operations",
+    "get_job_status": "core.operations",
+    "wait_for_job_completion": "core.operations",
+    "list_files": "core.operations",
+    "list_jobs": "core.operations",
+    "chat_with_model": "core.operations",
+    "chat_with_model_async": "core.operations",
+    "stream_response": "core.operations",
+    "compare_models": "core.operations",
+    "create_batch_chat_job": "core.operations",
+    "wait_for_batch_completion": "core.operations",
+    "download_batch_results": "core.operations",
+    "download_result_file": "core.operations",
+    "download_result_file_async": "core.operations",
+    "download_result_files": "core.operations",
+}
 
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    attr = getattr(importlib.import_module(module_name), name)
+    globals()[name] = attr
+    return attr
@@ -0,0 +1,91 @@
+"""
+Rate-limit-aware scheduling for concurrent OpenAI requests.
+"""
+
+import asyncio
+import time
+
+import openai
+
+
+class _MinuteBudget:
+    """A per-minute budget (requests or tokens) refilled on a rolling window."""
+
+    def __init__(self, budget: int):
+        self.budget = budget
+        self.window_start = time.monotonic()
+        self.used = 0
+        self.lock = asyncio.Lock()
+
+    async def spend(self, amount: int) -> None:
+        """Block until amount fits in the current minute's budget, then take it."""
+        # A request estimated above the whole budget could never fit and
+        # would spin here forever; let it through alone in a fresh window
+        amount = min(amount, self.budget)
+        while True:
+            async with self.lock:
+                now = time.monotonic()
+                if now - self.window_start >= 60:
+                    self.window_start = now
+                    self.used = 0
+                if self.used + amount <= self.budget:
+                    self.used += amount
+                    return
+                wait = 60 - (now - self.window_start)
+            await asyncio.sleep(wait)
+
+
+async def run_with_limits(
+    coro_factories,
+    rpm: int = 0,
+    tpm: int = 0,
+    token_estimates=None,
+    max_attempts: int = 5,
+) -> list:
+    """
+    Run request coroutines concurrently while pacing to rate limits.
+
+    Naive asyncio.gather over a large batch trips the account's RPM/TPM
+    limits, and the resulting 429 retries serialize progress. This pacer
+    holds requests back before they are sent and retries individual
+    requests on RateLimitError with exponential backoff.
+
+    Args:
+        coro_factories: Callables returning a fresh request coroutine each
+            time (a plain coroutine cannot be re-awaited on retry).
+        rpm: Requests-per-minute budget (0 = no request pacing).
+        tpm: Tokens-per-minute budget (0 or no estimates = no token pacing).
+        token_estimates: Optional per-request token estimates, matching
+            coro_factories by position.
+        max_attempts: Attempts per request before giving up on 429s.
+
+    Returns:
+        Results in input order.
+    """
+    coro_factories = list(coro_factories)
+    request_budget = _MinuteBudget(rpm) if rpm else None
+    token_budget = _MinuteBudget(tpm) if tpm and token_estimates else None
+    # Cap in-flight requests to the per-second share of the request budget
+    max_in_flight = max(1, rpm // 60) if rpm else max(1, len(coro_factories))
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def _run_one(index: int, factory) -> object:
+        async with semaphore:
+            if request_budget:
+                await request_budget.spend(1)
+            if token_budget:
+                await token_budget.spend(token_estimates[index])
+
+            delay = 1.0
+            for attempt in range(max_attempts):
+                try:
+                    return await factory()
+                except openai.RateLimitError:
+                    if attempt == max_attempts - 1:
+                        raise
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, 60)
+
+    return await asyncio.gather(*(
+        _run_one(i, factory) for i, factory in enumerate(coro_factories)
+    ))
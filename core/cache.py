@@ -0,0 +1,59 @@
+"""
+Small disk cache for repeated CLI calls.
+"""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+
+import orjson
+
+# Cache entries live under the user's cache dir, one JSON file per key.
+_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "finetune_openai"
+
+
+def _cache_path(key: tuple) -> Path:
+    """Map a cache key tuple to its file on disk."""
+    digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+    return _CACHE_DIR / f"{digest}.json"
+
+
+def cache_get(key: tuple, max_age: float):
+    """
+    Return the cached value for key, or None if absent, expired, or unreadable.
+
+    Args:
+        key: Tuple identifying the call (endpoint name plus parameters).
+        max_age: Maximum entry age in seconds.
+
+    Returns:
+        The cached value, or None on a miss.
+    """
+    path = _cache_path(key)
+    try:
+        entry = orjson.loads(path.read_bytes())
+        cached_at = entry["cached_at"]
+        value = entry["value"]
+    except (OSError, orjson.JSONDecodeError, KeyError, TypeError):
+        # Unreadable or wrong-shaped entries are misses, not crashes;
+        # they get overwritten by the next cache_set
+        return None
+
+    if time.time() - cached_at > max_age:
+        return None
+    return value
+
+
+def cache_set(key: tuple, value) -> None:
+    """
+    Store a JSON-serializable value for key on disk.
+
+    Args:
+        key: Tuple identifying the call (endpoint name plus parameters).
+        value: Value to cache.
+    """
+    _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    _cache_path(key).write_bytes(
+        orjson.dumps({"cached_at": time.time(), "value": value})
+    )
@@ -2,37 +2,165 @@
 OpenAI client setup and configuration.
 """
 
+import asyncio
 import os
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, OpenAI
 
+# Clients are cached per (api_key, base_url) so repeated setup calls within
+# one process share a connection pool instead of rebuilding TLS state.
+_SYNC_CLIENTS: dict = {}
+_ASYNC_CLIENTS: dict = {}
 
-def setup_openai_client(config: dict) -> OpenAI:
+
+def _build_client_kwargs(config: dict) -> dict:
     """
-    Initialize and return OpenAI client.
-    
+    Resolve client constructor kwargs from config and environment.
+
     Args:
         config: Configuration dictionary containing openai settings.
-        
+
     Returns:
-        Configured OpenAI client instance.
-        
+        Keyword arguments for the OpenAI client constructors.
+
     Raises:
         ValueError: If API key is not found in config or environment.
     """
     openai_config = config.get("openai", {})
-    
+
     api_key = openai_config.get("api_key") or os.environ.get("OPENAI_API_KEY")
     base_url = openai_config.get("base_url") or None
-    
+
     if not api_key:
         raise ValueError(
             "OpenAI API key not found. Set it in config.yaml or OPENAI_API_KEY environment variable."
         )
-    
+
     client_kwargs = {"api_key": api_key}
     if base_url:
         client_kwargs["base_url"] = base_url
-    
-    return OpenAI(**client_kwargs)
+
+    return client_kwargs
+
+
+def setup_openai_client(config: dict) -> OpenAI:
+    """
+    Initialize and return OpenAI client.
+
+    Clients are cached per credentials, so every call with the same config
+    returns the same instance and its keep-alive connections. The underlying
+    httpx.Client keeps idle connections alive well past httpx's 5 second
+    default, so slow polling loops (e.g. waiting on a fine-tuning job)
+    reuse one TCP/TLS connection instead of re-handshaking every poll.
+
+    Args:
+        config: Configuration dictionary containing openai settings.
+
+    Returns:
+        Configured OpenAI client instance.
+
+    Raises:
+        ValueError: If API key is not found in config or environment.
+    """
+    client_kwargs = _build_client_kwargs(config)
+    key = (client_kwargs["api_key"], client_kwargs.get("base_url"))
+
+    client = _SYNC_CLIENTS.get(key)
+    if client is None:
+        http_client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=300,
+            ),
+        )
+        client = _SYNC_CLIENTS[key] = OpenAI(
+            http_client=http_client, **client_kwargs
+        )
+    return client
+
+
+def setup_async_openai_client(config: dict) -> AsyncOpenAI:
+    """
+    Initialize and return asynchronous OpenAI client.
+
+    Clients are cached per credentials and built on an httpx.AsyncClient
+    with raised connection limits, so large asyncio fan-outs are not
+    throttled by the SDK's default pool size.
+
+    Args:
+        config: Configuration dictionary containing openai settings.
+
+    Returns:
+        Configured AsyncOpenAI client instance.
+
+    Raises:
+        ValueError: If API key is not found in config or environment.
+    """
+    client_kwargs = _build_client_kwargs(config)
+    key = (client_kwargs["api_key"], client_kwargs.get("base_url"))
+
+    client = _ASYNC_CLIENTS.get(key)
+    if client is None:
+        http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+        )
+        client = _ASYNC_CLIENTS[key] = AsyncOpenAI(
+            http_client=http_client, **client_kwargs
+        )
+    return client
+
+
+def run_async(coro):
+    """
+    Run a coroutine to completion, closing cached async clients with it.
+
+    httpx binds a pool's transports to the running event loop, so an
+    async client used inside one asyncio.run cannot be closed from a
+    later loop without hitting "Event loop is closed". Funnelling every
+    async entry point through here tears the pool down on the same loop
+    that used it.
+
+    Args:
+        coro: Coroutine to run.
+
+    Returns:
+        The coroutine's result.
+    """
+    async def _run():
+        try:
+            return await coro
+        finally:
+            if _ASYNC_CLIENTS:
+                clients = list(_ASYNC_CLIENTS.values())
+                _ASYNC_CLIENTS.clear()
+                await asyncio.gather(*(client.close() for client in clients))
+
+    return asyncio.run(_run())
+
+
+def close_clients() -> None:
+    """
+    Close cached sync clients and their connection pools.
+
+    Called once at the end of a CLI invocation so keep-alive sockets are
+    torn down promptly instead of waiting on garbage collection, which
+    logs unclosed-client warnings and can stall interpreter shutdown.
+    Async clients are closed by run_async on the loop that used them;
+    any still cached here were never run (so they hold no transports)
+    and can safely be closed on a fresh loop.
+    """
+    for client in _SYNC_CLIENTS.values():
+        client.close()
+    _SYNC_CLIENTS.clear()
+
+    if _ASYNC_CLIENTS:
+        async def _close_all():
+            await asyncio.gather(*(c.close() for c in _ASYNC_CLIENTS.values()))
+
+        asyncio.run(_close_all())
+        _ASYNC_CLIENTS.clear()
 
@@ -2,79 +2,138 @@
 Core operations for OpenAI fine-tuning: upload, job management, chat, and results.
 """
 
-import base64
+import asyncio
+import os
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 
-from openai import OpenAI
+import orjson
+from openai import AsyncOpenAI, OpenAI
 
-from core.utils import ensure_results_dir, get_output_filename
+from core.client import run_async
+from core.utils import FineTuneConfig, ensure_results_dir, get_output_filename
+
+
+# Part size for the Uploads API (its maximum is 64 MB per part). Files
+# larger than one part are uploaded in concurrent parts.
+_UPLOAD_PART_SIZE = 64 * 1024 * 1024
+_UPLOAD_WORKERS = 4
+
+
+def _upload_file_in_parts(client: OpenAI, file_path: str, size: int) -> str:
+    """
+    Upload a large file through the Uploads API with concurrent parts.
+
+    Parts are read sequentially but sent from a thread pool, with a
+    bounded window of in-flight parts so memory stays at a few part
+    sizes regardless of file size. Part order is preserved for the
+    complete call.
+
+    Args:
+        client: OpenAI client instance.
+        file_path: Path to the training data file.
+        size: File size in bytes.
+
+    Returns:
+        File ID from OpenAI.
+    """
+    upload = client.uploads.create(
+        purpose="fine-tune",
+        filename=os.path.basename(file_path),
+        bytes=size,
+        mime_type="text/jsonl",
+    )
+
+    def _create_part(data: bytes):
+        return client.uploads.parts.create(upload_id=upload.id, data=data)
+
+    part_ids: list[str] = []
+    try:
+        with open(file_path, "rb") as f, ThreadPoolExecutor(_UPLOAD_WORKERS) as pool:
+            pending: deque = deque()
+            for chunk in iter(lambda: f.read(_UPLOAD_PART_SIZE), b""):
+                pending.append(pool.submit(_create_part, chunk))
+                if len(pending) >= _UPLOAD_WORKERS * 2:
+                    part_ids.append(pending.popleft().result().id)
+            while pending:
+                part_ids.append(pending.popleft().result().id)
+    except BaseException:
+        client.uploads.cancel(upload_id=upload.id)
+        raise
+
+    completed = client.uploads.complete(upload_id=upload.id, part_ids=part_ids)
+    return completed.file.id
 
 
 def upload_training_file(client: OpenAI, file_path: str) -> str:
     """
     Upload training file to OpenAI.
-    
+
+    Files larger than one upload part go through the Uploads API with
+    concurrent part uploads; smaller files use a single streaming POST.
+
     Args:
         client: OpenAI client instance.
         file_path: Path to the training data file.
-        
+
     Returns:
         File ID from OpenAI.
     """
     print(f"Uploading training file: {file_path}")
-    
-    with open(file_path, "rb") as f:
-        response = client.files.create(file=f, purpose="fine-tune")
-    
-    print(f"File uploaded successfully. File ID: {response.id}")
-    return response.id
+
+    size = os.path.getsize(file_path)
+    if size > _UPLOAD_PART_SIZE:
+        file_id = _upload_file_in_parts(client, file_path, size)
+    else:
+        with open(file_path, "rb") as f:
+            file_id = client.files.create(file=f, purpose="fine-tune").id
+
+    print(f"File uploaded successfully. File ID: {file_id}")
+    return file_id
 
 
 def create_fine_tuning_job(
     client: OpenAI,
     training_file_id: str,
-    config: dict,
+    ft_config: FineTuneConfig,
     validation_file_id: Optional[str] = None,
 ) -> str:
     """
     Create a fine-tuning job.
-    
+
     Args:
         client: OpenAI client instance.
         training_file_id: OpenAI file ID for training data.
-        config: Configuration dictionary.
+        ft_config: Flattened fine-tuning settings.
         validation_file_id: Optional OpenAI file ID for validation data.
-        
+
     Returns:
         Fine-tuning job ID.
     """
-    ft_config = config.get("fine_tuning", {})
-    hyperparams = ft_config.get("hyperparameters", {})
-    
     # Build hyperparameters dict, only including non-auto values
     hyperparameters = {}
     for param in ["n_epochs", "batch_size", "learning_rate_multiplier"]:
-        value = hyperparams.get(param, "auto")
+        value = ft_config.hyperparameters.get(param, "auto")
         if value != "auto":
             hyperparameters[param] = value
-    
+
     job_kwargs = {
         "training_file": training_file_id,
-        "model": ft_config.get("model", "gpt-3.5-turbo"),
+        "model": ft_config.model,
     }
-    
+
     if hyperparameters:
         job_kwargs["hyperparameters"] = hyperparameters
-    
+
     if validation_file_id:
         job_kwargs["validation_file"] = validation_file_id
-    
-    suffix = ft_config.get("suffix")
-    if suffix:
-        job_kwargs["suffix"] = suffix
-    
+
+    if ft_config.suffix:
+        job_kwargs["suffix"] = ft_config.suffix
+
     print(f"Creating fine-tuning job with model: {job_kwargs['model']}")
     response = client.fine_tuning.jobs.create(**job_kwargs)
     
@@ -107,82 +166,129 @@ def get_job_status(client: OpenAI, job_id: str) -> dict:
 
 
 def wait_for_job_completion(
-    client: OpenAI, job_id: str, poll_interval: int = 30
+    client: OpenAI,
+    job_id: str,
+    poll_interval: int = 30,
+    max_interval: int = 120,
+    backoff: float = 1.5,
 ) -> dict:
     """
-    Wait for a fine-tuning job to complete, polling periodically.
-    
+    Wait for a fine-tuning job to complete, polling with exponential backoff.
+
+    The delay between status checks grows by ``backoff`` up to
+    ``max_interval`` while the status stays the same, and resets to
+    ``poll_interval`` whenever the job enters a new phase. This cuts API
+    calls on multi-hour jobs without delaying detection of phase changes.
+
     Args:
         client: OpenAI client instance.
         job_id: Fine-tuning job ID.
-        poll_interval: Seconds between status checks.
-        
+        poll_interval: Initial seconds between status checks.
+        max_interval: Ceiling for the polling delay.
+        backoff: Multiplier applied to the delay after each check.
+
     Returns:
         Final job status dictionary.
     """
     print(f"Waiting for job {job_id} to complete...")
-    
+
+    delay = poll_interval
+    last_status = None
     while True:
         status = get_job_status(client, job_id)
         current_status = status["status"]
-        
+
         print(f"[{datetime.now().strftime('%H:%M:%S')}] Status: {current_status}")
-        
+
         if current_status in ("succeeded", "failed", "cancelled"):
             return status
-        
-        time.sleep(poll_interval)
+
+        if current_status != last_status:
+            delay = poll_interval
+            last_status = current_status
+
+        time.sleep(delay)
+        delay = min(delay * backoff, max_interval)
+
+
+# Largest page size accepted by the list endpoints.
+_MAX_PAGE_SIZE = 100
+
+
+def _collect_pages(list_endpoint, limit: int) -> list:
+    """
+    Collect up to ``limit`` items from a cursor-paginated list endpoint.
+
+    Pages are requested at the maximum server-side page size. Fetches are
+    sequential by necessity: each page's ``after`` cursor only becomes known
+    when the previous page arrives.
+
+    Args:
+        list_endpoint: Bound .list method of an SDK resource.
+        limit: Maximum number of items to collect.
+
+    Returns:
+        Raw SDK items, at most ``limit`` of them.
+    """
+    items = []
+    params = {"limit": min(limit, _MAX_PAGE_SIZE)}
+    while len(items) < limit:
+        page = list_endpoint(**params)
+        items.extend(page.data[: limit - len(items)])
+        if not page.data or not getattr(page, "has_more", False):
+            break
+        params = {
+            "limit": min(limit - len(items), _MAX_PAGE_SIZE),
+            "after": page.data[-1].id,
+        }
+    return items
 
 
 def list_files(client: OpenAI, limit: int = 20) -> list[dict]:
     """
     List files uploaded to OpenAI.
-    
+
     Args:
         client: OpenAI client instance.
         limit: Maximum number of files to return.
-        
+
     Returns:
         List of file information dictionaries.
     """
-    files = []
-    for f in client.files.list():
-        files.append({
+    return [
+        {
             "id": f.id,
             "filename": f.filename,
             "created_at": f.created_at,
             "purpose": f.purpose,
             "status": f.status,
-        })
-        if len(files) >= limit:
-            break
-    return files
+        }
+        for f in _collect_pages(client.files.list, limit)
+    ]
 
 
 def list_jobs(client: OpenAI, limit: int = 20) -> list[dict]:
     """
     List fine-tuning jobs.
-    
+
     Args:
         client: OpenAI client instance.
         limit: Maximum number of jobs to return.
-        
+
     Returns:
         List of job information dictionaries.
     """
-    jobs = []
-    for job in client.fine_tuning.jobs.list():
-        jobs.append({
+    return [
+        {
             "id": job.id,
             "model": job.model,
             "status": job.status,
             "fine_tuned_model": job.fine_tuned_model,
             "created_at": job.created_at,
             "finished_at": job.finished_at,
-        })
-        if len(jobs) >= limit:
-            break
-    return jobs
+        }
+        for job in _collect_pages(client.fine_tuning.jobs.list, limit)
+    ]
 
 
 def chat_with_model(
@@ -213,8 +319,83 @@ def chat_with_model(
     return completion.choices[0].message.content
 
 
-def compare_models(
+def stream_response(
     client: OpenAI,
+    model: str,
+    user_message: str,
+    system_message: str = "You are a helpful assistant.",
+    previous_response_id: Optional[str] = None,
+):
+    """
+    Stream a model response via the Responses API, yielding text deltas.
+
+    Conversation state is stored server-side (store=True): pass the ID of
+    the previous response and only the new user message goes over the wire,
+    so the server reuses its cache of the earlier turns instead of
+    reprocessing them on every call.
+
+    Args:
+        client: OpenAI client instance.
+        model: Model name or fine-tuned model ID.
+        user_message: User's message content.
+        system_message: Instructions for the conversation.
+        previous_response_id: ID of the previous response to continue from.
+
+    Yields:
+        Chunks of the assistant's response text.
+
+    Returns:
+        The response ID, to thread into the next call.
+    """
+    kwargs = {
+        "model": model,
+        "input": user_message,
+        "instructions": system_message,
+        "store": True,
+        "stream": True,
+    }
+    if previous_response_id:
+        kwargs["previous_response_id"] = previous_response_id
+
+    response_id = None
+    for event in client.responses.create(**kwargs):
+        if event.type == "response.output_text.delta":
+            yield event.delta
+        elif event.type == "response.completed":
+            response_id = event.response.id
+    return response_id
+
+
+async def chat_with_model_async(
+    client: AsyncOpenAI,
+    model: str,
+    user_message: str,
+    system_message: str = "You are a helpful assistant.",
+) -> str:
+    """
+    Send a chat message to the model asynchronously and return the response.
+
+    Args:
+        client: Asynchronous OpenAI client instance.
+        model: Model name or fine-tuned model ID.
+        user_message: User's message content.
+        system_message: System prompt for the conversation.
+
+    Returns:
+        Assistant's response content.
+    """
+    completion = await client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": user_message},
+        ],
+    )
+    return completion.choices[0].message.content
+
+
+async def compare_models(
+    client: AsyncOpenAI,
     base_model: str,
     finetuned_model: str,
     user_message: str,
@@ -222,24 +403,29 @@ def compare_models(
 ) -> dict:
     """
     Compare responses between base model and fine-tuned model.
-    
+
+    Both completions are dispatched concurrently with asyncio.gather, so a
+    comparison costs roughly one round-trip instead of two.
+
     Args:
-        client: OpenAI client instance.
+        client: Asynchronous OpenAI client instance.
         base_model: Base model name (e.g., gpt-3.5-turbo).
         finetuned_model: Fine-tuned model ID.
         user_message: User's message content.
         system_message: System prompt for the conversation.
-        
+
     Returns:
         Dictionary containing both responses.
     """
     print(f"Sending prompt to both models...")
     print(f"  Base model: {base_model}")
     print(f"  Fine-tuned model: {finetuned_model}")
-    
-    base_response = chat_with_model(client, base_model, user_message, system_message)
-    finetuned_response = chat_with_model(client, finetuned_model, user_message, system_message)
-    
+
+    base_response, finetuned_response = await asyncio.gather(
+        chat_with_model_async(client, base_model, user_message, system_message),
+        chat_with_model_async(client, finetuned_model, user_message, system_message),
+    )
+
     return {
         "prompt": user_message,
         "system_message": system_message,
@@ -250,6 +436,119 @@ def compare_models(
     }
 
 
+def create_batch_chat_job(
+    client: OpenAI,
+    model: str,
+    prompts: list[str],
+    system_message: str = "You are a helpful assistant.",
+) -> str:
+    """
+    Submit a batch of chat prompts via the Batch API.
+
+    Batch jobs complete asynchronously within 24 hours at half the price of
+    synchronous calls and with far higher rate limits, which is the right
+    tradeoff for bulk offline evaluation.
+
+    Args:
+        client: OpenAI client instance.
+        model: Model name or fine-tuned model ID.
+        prompts: User messages, one request per prompt.
+        system_message: System prompt shared by all requests.
+
+    Returns:
+        Batch job ID.
+    """
+    lines = [
+        orjson.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": system_message},
+                    {"role": "user", "content": prompt},
+                ],
+            },
+        })
+        for i, prompt in enumerate(prompts)
+    ]
+
+    print(f"Uploading batch input with {len(prompts)} requests...")
+    batch_file = client.files.create(
+        file=("batch_input.jsonl", b"\n".join(lines) + b"\n"),
+        purpose="batch",
+    )
+
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+
+    print(f"Batch job created. Batch ID: {batch.id}")
+    return batch.id
+
+
+def wait_for_batch_completion(
+    client: OpenAI,
+    batch_id: str,
+    poll_interval: int = 30,
+    max_interval: int = 120,
+    backoff: float = 1.5,
+):
+    """
+    Wait for a batch job to finish, polling with exponential backoff.
+
+    Uses the same capped-backoff schedule as wait_for_job_completion.
+
+    Args:
+        client: OpenAI client instance.
+        batch_id: Batch job ID.
+        poll_interval: Initial seconds between status checks.
+        max_interval: Ceiling for the polling delay.
+        backoff: Multiplier applied to the delay after each check.
+
+    Returns:
+        The final Batch object.
+    """
+    print(f"Waiting for batch {batch_id} to complete...")
+
+    delay = poll_interval
+    last_status = None
+    while True:
+        batch = client.batches.retrieve(batch_id)
+
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] Status: {batch.status}")
+
+        if batch.status in ("completed", "failed", "cancelled", "expired"):
+            return batch
+
+        if batch.status != last_status:
+            delay = poll_interval
+            last_status = batch.status
+
+        time.sleep(delay)
+        delay = min(delay * backoff, max_interval)
+
+
+def download_batch_results(client: OpenAI, batch) -> list[dict]:
+    """
+    Download and parse the output of a completed batch job.
+
+    Args:
+        client: OpenAI client instance.
+        batch: Completed Batch object with an output_file_id.
+
+    Returns:
+        Parsed result dictionaries, sorted by custom_id (input order).
+    """
+    content = client.files.content(batch.output_file_id)
+    results = [orjson.loads(line) for line in content.read().splitlines() if line]
+    results.sort(key=lambda result: int(result["custom_id"]))
+    return results
+
+
 def download_result_file(client: OpenAI, file_id: str) -> str:
     """
     Download and save the result file from a fine-tuning job.
@@ -262,17 +561,68 @@ def download_result_file(client: OpenAI, file_id: str) -> str:
         Path to the saved file.
     """
     results_dir = ensure_results_dir()
-    
-    file_contents = client.files.content(file_id)
-    decoded_bytes = base64.b64decode(file_contents.read())
-    decoded_str = decoded_bytes.decode("utf-8")
-    
-    output_filename = get_output_filename("training_metrics", "csv")
+
+    # Keyed by file_id: the timestamp alone is second-granular, so
+    # concurrent downloads of several result files would share one path
+    output_filename = get_output_filename(f"training_metrics_{file_id}", "csv")
     output_path = results_dir / output_filename
-    
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(decoded_str)
-    
+
+    # The SDK already returns decoded bytes; stream them straight to disk
+    # instead of buffering (and base64-decoding) the whole file in memory.
+    with client.files.with_streaming_response.content(file_id) as response:
+        response.stream_to_file(output_path)
+
+    print(f"Result file saved to: {output_path}")
+    return str(output_path)
+
+
+async def download_result_file_async(client: AsyncOpenAI, file_id: str) -> str:
+    """
+    Download and save a result file without blocking the event loop.
+
+    The body is streamed to disk in chunks as it arrives, so large files
+    are never fully buffered and concurrent downloads overlap network
+    reads with disk writes.
+
+    Args:
+        client: AsyncOpenAI client instance.
+        file_id: OpenAI file ID for the result file.
+
+    Returns:
+        Path to the saved file.
+    """
+    results_dir = ensure_results_dir()
+
+    # Keyed by file_id so gathered downloads never share an output path
+    output_filename = get_output_filename(f"training_metrics_{file_id}", "csv")
+    output_path = results_dir / output_filename
+
+    async with client.files.with_streaming_response.content(file_id) as response:
+        await response.stream_to_file(output_path)
+
     print(f"Result file saved to: {output_path}")
     return str(output_path)
 
+
+def download_result_files(client: AsyncOpenAI, file_ids: list[str]) -> list[str]:
+    """
+    Download multiple result files concurrently.
+
+    Downloads run as coroutines on one event loop, sharing the async
+    client's connection pool instead of fanning out worker threads.
+
+    Args:
+        client: AsyncOpenAI client instance.
+        file_ids: OpenAI file IDs for the result files.
+
+    Returns:
+        Paths to the saved files, in input order.
+    """
+    async def _download_all() -> list[str]:
+        return await asyncio.gather(*(
+            download_result_file_async(client, file_id) for file_id in file_ids
+        ))
+
+    # run_async also closes the cached async clients on this same loop
+    return run_async(_download_all())
+
@@ -7,159 +7,240 @@ Command-line interface for fine-tuning GPT models using OpenAI's API.
 
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-from core import (
-    setup_openai_client,
-    load_config,
-    load_training_data,
-    validate_data_format,
-    upload_training_file,
-    create_fine_tuning_job,
-    get_job_status,
-    wait_for_job_completion,
-    list_files,
-    list_jobs,
-    chat_with_model,
-    compare_models,
-    download_result_file,
-)
-
-
-def cmd_validate(args, config: dict) -> None:
+# Deliberately `import core` (not from-imports): core resolves its re-exports
+# lazily, so the OpenAI SDK is only imported once a handler actually needs it.
+import core
+
+def cmd_validate(args, config: dict, ft: core.FineTuneConfig) -> None:
     """Validate training data format."""
-    training_file = args.file or config.get("fine_tuning", {}).get("training_file")
+    training_file = args.file
+    if not training_file:
+        # Config is only consulted when no file was given on the command line
+        training_file = core.FineTuneConfig.from_config(
+            core.load_config(args.config)
+        ).training_file
     
     if not training_file:
         print("Error: No training file specified.")
         sys.exit(1)
     
     print(f"Validating data format: {training_file}")
-    data = load_training_data(training_file)
-    errors = validate_data_format(data)
-    
+
+    # Shards large files across processes; small ones stream in-process
+    errors, count = core.validate_file_parallel(training_file, args.workers)
+
     if errors:
         print("\nFound errors:")
         for k, v in errors.items():
             print(f"  {k}: {v}")
         sys.exit(1)
     else:
-        print(f"\nNo errors found. {len(data)} examples validated successfully.")
+        print(f"\nNo errors found. {count} examples validated successfully.")
 
 
-def cmd_upload(args, config: dict) -> None:
+def cmd_upload(args, config: dict, ft: core.FineTuneConfig) -> None:
     """Upload training file to OpenAI."""
-    client = setup_openai_client(config)
-    training_file = args.file or config.get("fine_tuning", {}).get("training_file")
+    client = core.setup_openai_client(config)
+    training_file = args.file or ft.training_file
     
     if not training_file:
         print("Error: No training file specified.")
         sys.exit(1)
     
-    file_id = upload_training_file(client, training_file)
+    file_id = core.upload_training_file(client, training_file)
     print(f"\nUse this file ID in your fine-tuning job: {file_id}")
 
 
-def cmd_create(args, config: dict) -> None:
+def cmd_create(args, config: dict, ft: core.FineTuneConfig) -> None:
     """Create a fine-tuning job."""
-    client = setup_openai_client(config)
+    client = core.setup_openai_client(config)
     
     if not args.training_file_id:
         print("Error: --training-file-id is required.")
         sys.exit(1)
     
-    job_id = create_fine_tuning_job(
+    job_id = core.create_fine_tuning_job(
         client,
         args.training_file_id,
-        config,
+        ft,
         args.validation_file_id,
     )
     
     if args.wait:
-        status = wait_for_job_completion(client, job_id)
+        status = core.wait_for_job_completion(
+            client, job_id, args.poll_initial, args.poll_max, args.backoff
+        )
         print(f"\nJob completed with status: {status['status']}")
         
         if status["fine_tuned_model"]:
             print(f"Fine-tuned model: {status['fine_tuned_model']}")
         
         if status["result_files"]:
-            for file_id in status["result_files"]:
-                download_result_file(client, file_id)
+            core.download_result_files(
+                core.setup_async_openai_client(config), status["result_files"]
+            )
 
 
-def cmd_status(args, config: dict) -> None:
+def cmd_status(args, config: dict, ft: core.FineTuneConfig) -> None:
     """Get status of a fine-tuning job."""
-    client = setup_openai_client(config)
+    client = core.setup_openai_client(config)
     
     if not args.job_id:
         print("Error: --job-id is required.")
         sys.exit(1)
     
-    status = get_job_status(client, args.job_id)
+    status = core.get_job_status(client, args.job_id)
     
     print("\nJob Status:")
     for key, value in status.items():
         print(f"  {key}: {value}")
 
 
-def cmd_list_files(args, config: dict) -> None:
+def _cache_max_age(config: dict) -> float:
+    """Read the cache TTL in seconds from config (default: 300)."""
+    return config.get("cache", {}).get("max_age", 300)
+
+
+def cmd_list_files(args, config: dict, ft: core.FineTuneConfig) -> None:
     """List uploaded files."""
-    client = setup_openai_client(config)
-    files = list_files(client, args.limit)
-    
-    print(f"\nFiles (showing up to {args.limit}):")
-    for i, f in enumerate(files):
-        print(f"  {i+1}. {f['id']} - {f['filename']} ({f['status']})")
+    cache_key = ("list_files", args.limit)
+    files = None if args.no_cache else core.cache_get(cache_key, _cache_max_age(config))
+
+    if files is None:
+        client = core.setup_openai_client(config)
+        files = core.list_files(client, args.limit)
+        core.cache_set(cache_key, files)
 
+    # One write instead of a print per line; matters for large --limit values
+    sys.stdout.write(f"\nFiles (showing up to {args.limit}):\n")
+    sys.stdout.write("\n".join(
+        f"  {i+1}. {f['id']} - {f['filename']} ({f['status']})"
+        for i, f in enumerate(files)
+    ) + "\n")
 
-def cmd_list_jobs(args, config: dict) -> None:
+
+def cmd_list_jobs(args, config: dict, ft: core.FineTuneConfig) -> None:
     """List fine-tuning jobs."""
-    client = setup_openai_client(config)
-    jobs = list_jobs(client, args.limit)
-    
-    print(f"\nFine-tuning Jobs (showing up to {args.limit}):")
-    for i, job in enumerate(jobs):
-        model_info = job['fine_tuned_model'] or 'pending'
-        print(f"  {i+1}. {job['id']} - {job['status']} - {model_info}")
+    cache_key = ("list_jobs", args.limit)
+    jobs = None if args.no_cache else core.cache_get(cache_key, _cache_max_age(config))
+
+    if jobs is None:
+        client = core.setup_openai_client(config)
+        jobs = core.list_jobs(client, args.limit)
+        core.cache_set(cache_key, jobs)
+
+    sys.stdout.write(f"\nFine-tuning Jobs (showing up to {args.limit}):\n")
+    sys.stdout.write("\n".join(
+        f"  {i+1}. {job['id']} - {job['status']} - {job['fine_tuned_model'] or 'pending'}"
+        for i, job in enumerate(jobs)
+    ) + "\n")
 
 
-def cmd_chat(args, config: dict) -> None:
+def cmd_chat(args, config: dict, ft: core.FineTuneConfig) -> None:
     """Chat with a fine-tuned model."""
-    client = setup_openai_client(config)
-    
     if not args.model:
         print("Error: --model is required.")
         sys.exit(1)
-    
-    response = chat_with_model(
-        client,
-        args.model,
-        args.message,
-        args.system or "You are a helpful assistant.",
-    )
-    
-    print(f"\nResponse:\n{response}")
 
+    system_message = args.system or "You are a helpful assistant."
 
-def cmd_compare(args, config: dict) -> None:
+    messages = list(args.message or [])
+    if args.input:
+        with open(args.input, "r", encoding="utf-8") as f:
+            messages.extend(line.strip() for line in f if line.strip())
+
+    if not messages:
+        print("Error: no messages given (use --message or --input).")
+        sys.exit(1)
+
+    if args.batch:
+        # Offline path: half price and far higher rate limits, completes
+        # within 24h
+        client = core.setup_openai_client(config)
+        batch_id = core.create_batch_chat_job(client, args.model, messages, system_message)
+        batch = core.wait_for_batch_completion(client, batch_id)
+
+        if batch.status != "completed":
+            print(f"\nBatch finished with status: {batch.status}")
+            sys.exit(1)
+
+        responses = [
+            result["response"]["body"]["choices"][0]["message"]["content"]
+            for result in core.download_batch_results(client, batch)
+        ]
+    else:
+        max_age = _cache_max_age(config)
+        responses = [None] * len(messages)
+        pending = []
+        for i, message in enumerate(messages):
+            cached = None
+            if not args.no_cache:
+                cached = core.cache_get(
+                    ("chat", args.model, system_message, message), max_age
+                )
+            if cached is None:
+                pending.append(i)
+            else:
+                responses[i] = cached
+
+        if pending:
+            client = core.setup_async_openai_client(config)
+            rate_limits = ft.rate_limits
+
+            # Uncached prompts are dispatched concurrently (paced to the
+            # configured rate limits), so N messages cost roughly one
+            # round-trip instead of N
+            factories = [
+                lambda i=i: core.chat_with_model_async(
+                    client, args.model, messages[i], system_message
+                )
+                for i in pending
+            ]
+            # Rough chars/4 prompt estimate plus headroom for the response
+            token_estimates = [
+                (len(system_message) + len(messages[i])) // 4 + 300 for i in pending
+            ]
+
+            fanned_out = core.run_async(core.run_with_limits(
+                factories,
+                rpm=rate_limits.get("rpm", 0),
+                tpm=rate_limits.get("tpm", 0),
+                token_estimates=token_estimates,
+            ))
+
+            for i, response in zip(pending, fanned_out):
+                responses[i] = response
+                core.cache_set(("chat", args.model, system_message, messages[i]), response)
+
+    for message, response in zip(messages, responses):
+        if len(messages) > 1:
+            print(f"\nMessage: {message}")
+        print(f"\nResponse:\n{response}")
+
+
+def cmd_compare(args, config: dict, ft: core.FineTuneConfig) -> None:
     """Compare responses between base model and fine-tuned model."""
-    client = setup_openai_client(config)
-    
+    client = core.setup_async_openai_client(config)
+
     # Get base model from args or config
-    base_model = args.base_model or config.get("fine_tuning", {}).get("model", "gpt-3.5-turbo")
-    
+    base_model = args.base_model or ft.model
+
     if not args.finetuned_model:
         print("Error: --finetuned-model is required.")
         sys.exit(1)
-    
+
     system_message = args.system or "You are a helpful assistant."
-    
-    comparison = compare_models(
+
+    # Both completions run concurrently on one event loop
+    comparison = core.run_async(core.compare_models(
         client,
         base_model,
         args.finetuned_model,
         args.message,
         system_message,
-    )
+    ))
     
     # Display results
     print("\n" + "=" * 60)
@@ -179,10 +260,10 @@ def cmd_compare(args, config: dict) -> None:
     print(comparison['finetuned_response'])
 
 
-def cmd_run(args, config: dict) -> None:
+def cmd_run(args, config: dict, ft: core.FineTuneConfig) -> None:
     """Run the complete fine-tuning workflow."""
-    client = setup_openai_client(config)
-    training_file = args.file or config.get("fine_tuning", {}).get("training_file")
+    client = core.setup_openai_client(config)
+    training_file = args.file or ft.training_file
     
     if not training_file:
         print("Error: No training file specified.")
@@ -190,27 +271,29 @@ def cmd_run(args, config: dict) -> None:
     
     # Step 1: Validate data
     print("\n=== Step 1: Validating training data ===")
-    data = load_training_data(training_file)
-    errors = validate_data_format(data)
-    
+    # Single streaming parse+validate pass; the examples are never kept
+    errors, count = core.validate_file_parallel(training_file)
+
     if errors:
         print("Found errors in training data:")
         for k, v in errors.items():
             print(f"  {k}: {v}")
         sys.exit(1)
-    print(f"Validation passed. {len(data)} examples found.")
+    print(f"Validation passed. {count} examples found.")
     
     # Step 2: Upload file
     print("\n=== Step 2: Uploading training file ===")
-    file_id = upload_training_file(client, training_file)
+    file_id = core.upload_training_file(client, training_file)
     
     # Step 3: Create fine-tuning job
     print("\n=== Step 3: Creating fine-tuning job ===")
-    job_id = create_fine_tuning_job(client, file_id, config)
+    job_id = core.create_fine_tuning_job(client, file_id, ft)
     
     # Step 4: Wait for completion
     print("\n=== Step 4: Waiting for job completion ===")
-    status = wait_for_job_completion(client, job_id)
+    status = core.wait_for_job_completion(
+        client, job_id, args.poll_initial, args.poll_max, args.backoff
+    )
     
     print(f"\nJob completed with status: {status['status']}")
     
@@ -220,13 +303,121 @@ def cmd_run(args, config: dict) -> None:
         # Download result files
         if status["result_files"]:
             print("\n=== Downloading result files ===")
-            for result_file_id in status["result_files"]:
-                download_result_file(client, result_file_id)
+            core.download_result_files(
+                core.setup_async_openai_client(config), status["result_files"]
+            )
     else:
         print(f"\n✗ Job failed with error: {status.get('error')}")
         sys.exit(1)
 
 
+def _add_validate_parser(subparsers) -> None:
+    validate_parser = subparsers.add_parser("validate", help="Validate training data format")
+    validate_parser.add_argument("--file", help="Path to training data file")
+    validate_parser.add_argument(
+        "--workers", type=int, help="Validation processes (default: CPU count)"
+    )
+
+
+def _add_upload_parser(subparsers) -> None:
+    upload_parser = subparsers.add_parser("upload", help="Upload training file to OpenAI")
+    upload_parser.add_argument("--file", help="Path to training data file")
+
+
+def _add_create_parser(subparsers) -> None:
+    create_parser = subparsers.add_parser("create", help="Create a fine-tuning job")
+    create_parser.add_argument("--training-file-id", required=True, help="OpenAI file ID for training data")
+    create_parser.add_argument("--validation-file-id", help="OpenAI file ID for validation data")
+    create_parser.add_argument("--wait", action="store_true", help="Wait for job completion")
+    _add_poll_args(create_parser)
+
+
+def _add_status_parser(subparsers) -> None:
+    status_parser = subparsers.add_parser("status", help="Get fine-tuning job status")
+    status_parser.add_argument("--job-id", required=True, help="Fine-tuning job ID")
+
+
+def _add_list_files_parser(subparsers) -> None:
+    list_files_parser = subparsers.add_parser("list-files", help="List uploaded files")
+    list_files_parser.add_argument("--limit", type=int, default=20, help="Maximum files to list")
+    list_files_parser.add_argument("--no-cache", action="store_true", help="Bypass the local disk cache")
+
+
+def _add_list_jobs_parser(subparsers) -> None:
+    list_jobs_parser = subparsers.add_parser("list-jobs", help="List fine-tuning jobs")
+    list_jobs_parser.add_argument("--limit", type=int, default=20, help="Maximum jobs to list")
+    list_jobs_parser.add_argument("--no-cache", action="store_true", help="Bypass the local disk cache")
+
+
+def _add_chat_parser(subparsers) -> None:
+    chat_parser = subparsers.add_parser("chat", help="Chat with a model")
+    chat_parser.add_argument("--model", required=True, help="Model name/ID to use")
+    chat_parser.add_argument(
+        "--message", nargs="+",
+        help="User message(s); multiple messages are sent concurrently",
+    )
+    chat_parser.add_argument(
+        "--input",
+        help="Path to a file with one user message per line",
+    )
+    chat_parser.add_argument(
+        "--batch", action="store_true",
+        help="Submit messages as a Batch API job (half price, completes within 24h)",
+    )
+    chat_parser.add_argument("--no-cache", action="store_true", help="Bypass the local disk cache")
+    chat_parser.add_argument("--system", help="System message")
+
+
+def _add_compare_parser(subparsers) -> None:
+    compare_parser = subparsers.add_parser("compare", help="Compare base model vs fine-tuned model")
+    compare_parser.add_argument("--base-model", help="Base model name (default: from config)")
+    compare_parser.add_argument("--finetuned-model", required=True, help="Fine-tuned model ID")
+    compare_parser.add_argument("--message", required=True, help="User message to send to both models")
+    compare_parser.add_argument("--system", help="System message")
+
+
+def _add_run_parser(subparsers) -> None:
+    run_parser = subparsers.add_parser("run", help="Run complete fine-tuning workflow")
+    run_parser.add_argument("--file", help="Path to training data file")
+    _add_poll_args(run_parser)
+
+
+# Command name -> (handler, parser builder, needs_config). Only the invoked
+# command's subparser is constructed, keeping startup cheap for frequent
+# commands, and commands that can run without config skip the YAML parse.
+_COMMANDS = {
+    "validate": (cmd_validate, _add_validate_parser, False),
+    "upload": (cmd_upload, _add_upload_parser, True),
+    "create": (cmd_create, _add_create_parser, True),
+    "status": (cmd_status, _add_status_parser, True),
+    "list-files": (cmd_list_files, _add_list_files_parser, True),
+    "list-jobs": (cmd_list_jobs, _add_list_jobs_parser, True),
+    "chat": (cmd_chat, _add_chat_parser, True),
+    "compare": (cmd_compare, _add_compare_parser, True),
+    "run": (cmd_run, _add_run_parser, True),
+}
+
+# Commands that always build an OpenAI client (listing commands may be served
+# entirely from the disk cache, so they are not warmed).
+_CLIENT_COMMANDS = {"upload", "create", "status", "chat", "compare", "run"}
+
+
+def _add_poll_args(parser) -> None:
+    """Add job-polling options shared by the create and run commands."""
+    parser.add_argument(
+        "--poll-initial", type=int, default=30,
+        help="Initial seconds between job status checks (default: 30)",
+    )
+    parser.add_argument(
+        "--poll-max", type=int, default=120,
+        help="Maximum seconds between job status checks (default: 120)",
+    )
+    parser.add_argument(
+        "--backoff", type=float, default=1.5,
+        help="Multiplier applied to the polling delay after each check (default: 1.5)",
+    )
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -267,74 +458,53 @@ Examples:
         help="Path to configuration file (default: config.yaml)",
     )
     
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
-    
-    # Validate command
-    validate_parser = subparsers.add_parser("validate", help="Validate training data format")
-    validate_parser.add_argument("--file", help="Path to training data file")
-    
-    # Upload command
-    upload_parser = subparsers.add_parser("upload", help="Upload training file to OpenAI")
-    upload_parser.add_argument("--file", help="Path to training data file")
-    
-    # Create command
-    create_parser = subparsers.add_parser("create", help="Create a fine-tuning job")
-    create_parser.add_argument("--training-file-id", required=True, help="OpenAI file ID for training data")
-    create_parser.add_argument("--validation-file-id", help="OpenAI file ID for validation data")
-    create_parser.add_argument("--wait", action="store_true", help="Wait for job completion")
-    
-    # Status command
-    status_parser = subparsers.add_parser("status", help="Get fine-tuning job status")
-    status_parser.add_argument("--job-id", required=True, help="Fine-tuning job ID")
-    
-    # List files command
-    list_files_parser = subparsers.add_parser("list-files", help="List uploaded files")
-    list_files_parser.add_argument("--limit", type=int, default=20, help="Maximum files to list")
-    
-    # List jobs command
-    list_jobs_parser = subparsers.add_parser("list-jobs", help="List fine-tuning jobs")
-    list_jobs_parser.add_argument("--limit", type=int, default=20, help="Maximum jobs to list")
-    
-    # Chat command
-    chat_parser = subparsers.add_parser("chat", help="Chat with a model")
-    chat_parser.add_argument("--model", required=True, help="Model name/ID to use")
-    chat_parser.add_argument("--message", required=True, help="User message")
-    chat_parser.add_argument("--system", help="System message")
-    
-    # Compare command
-    compare_parser = subparsers.add_parser("compare", help="Compare base model vs fine-tuned model")
-    compare_parser.add_argument("--base-model", help="Base model name (default: from config)")
-    compare_parser.add_argument("--finetuned-model", required=True, help="Fine-tuned model ID")
-    compare_parser.add_argument("--message", required=True, help="User message to send to both models")
-    compare_parser.add_argument("--system", help="System message")
-    
-    # Run command (complete workflow)
-    run_parser = subparsers.add_parser("run", help="Run complete fine-tuning workflow")
-    run_parser.add_argument("--file", help="Path to training data file")
-    
+    subparsers = parser.add_subparsers(
+        dest="command",
+        metavar="{%s}" % ",".join(_COMMANDS),
+        help="Available commands",
+    )
+
+    # Register only the invoked command's arguments; building all nine
+    # subparsers just to run one is wasted startup work
+    command = next((arg for arg in sys.argv[1:] if arg in _COMMANDS), None)
+    if command is not None:
+        _COMMANDS[command][1](subparsers)
+
     args = parser.parse_args()
-    
+
     if not args.command:
         parser.print_help()
         sys.exit(1)
-    
-    # Load configuration
-    config = load_config(args.config)
-    
+
+    handler, _, needs_config = _COMMANDS[args.command]
+
+    # Load configuration (skipped for commands that don't need it)
+    if not needs_config:
+        config = {}
+    elif args.command in _CLIENT_COMMANDS:
+        # Overlap the YAML parse with the OpenAI SDK import -- the two
+        # independent halves of client-command startup
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            config_future = executor.submit(core.load_config, args.config)
+            # Bound to a throwaway name: `import core.client` would shadow
+            # the module-level `core` with a function local
+            from core import client as _warm  # noqa: F401
+            del _warm
+            config = config_future.result()
+    else:
+        config = core.load_config(args.config)
+
+    # Flatten the fine_tuning subtree once; handlers read attributes
+    ft = core.FineTuneConfig.from_config(config)
+
     # Dispatch to command handler
-    commands = {
-        "validate": cmd_validate,
-        "upload": cmd_upload,
-        "create": cmd_create,
-        "status": cmd_status,
-        "list-files": cmd_list_files,
-        "list-jobs": cmd_list_jobs,
-        "chat": cmd_chat,
-        "compare": cmd_compare,
-        "run": cmd_run,
-    }
-    
-    commands[args.command](args, config)
+    try:
+        handler(args, config, ft)
+    finally:
+        # Only if a client was (possibly) built; touching core.close_clients
+        # unconditionally would drag in the SDK for commands that skip it
+        if "core.client" in sys.modules:
+            core.close_clients()
 
 
 if __name__ == "__main__":